@@ -20,6 +20,21 @@ def _resolve_loose(p: Path) -> Path:
             return p
 
 
+def _rel_to(base_str: str, abs_str: str) -> str | None:
+    """
+    abs_str が base_str 配下なら posix 相対パス（同一なら "."）、外なら None。
+    比較は normcase で（Windows は大文字小文字を区別しない）、相対部分は元の文字列から切り出す。
+    """
+    abs_cmp = os.path.normcase(abs_str)
+    base_cmp = os.path.normcase(base_str)
+    if abs_cmp == base_cmp:
+        return "."
+    base_sep = os.path.join(base_cmp, "")
+    if not abs_cmp.startswith(base_sep):
+        return None
+    return abs_str[len(base_sep):].replace(os.sep, "/")
+
+
 def normalize_excludes(raw_csv: str, project_dir: Path, target_dir: Path) -> str:
     """
     cook側で exclude を補正する。
@@ -30,6 +45,10 @@ def normalize_excludes(raw_csv: str, project_dir: Path, target_dir: Path) -> str
     if not raw_csv:
         return ""
 
+    # project_dir / target_dir は解決済みなので、token ごとの resolve() はせず文字列演算で判定する
+    project_str = os.fspath(project_dir)
+    target_str = os.fspath(target_dir)
+
     out = []
     for token in raw_csv.split(","):
         t = token.strip()
@@ -40,19 +59,15 @@ def normalize_excludes(raw_csv: str, project_dir: Path, target_dir: Path) -> str
 
         # パスっぽい（スラッシュ含む）ものは補正対象
         if "/" in t or t.startswith("."):
-            cand = Path(t)
-
             # 絶対/相対どちらでも project_dir 基準でまず解決
-            abs1 = _resolve_loose(cand if cand.is_absolute() else (project_dir / cand))
-            abs2 = _resolve_loose(cand if cand.is_absolute() else (target_dir / cand))
+            abs1 = os.path.normpath(os.path.join(project_str, t))
+            abs2 = os.path.normpath(os.path.join(target_str, t))
 
             rel = None
-            for abs_p in (abs1, abs2):
-                try:
-                    rel = abs_p.relative_to(target_dir).as_posix()
+            for abs_s in (abs1, abs2):
+                rel = _rel_to(target_str, abs_s)
+                if rel is not None:
                     break
-                except Exception:
-                    pass
 
             # target配下に落とせたら相対prefixにする
             if rel:
@@ -128,6 +143,8 @@ def main() -> int:
                         help="Limit structure entries. (alias: --structure-max)")
 
     parser.add_argument("--dry-run", action="store_true", help="Print mapped command and exit")
+    parser.add_argument("--spawn", action="store_true",
+                        help="Run dirdump as a separate process instead of in-process")
     parser.add_argument("-v", "--verbose", action="store_true", help="Print mapped command before run")
 
     # 未知オプションは dirdump にそのまま渡す
@@ -142,10 +159,38 @@ def main() -> int:
     if args.dry_run:
         return 0
 
+    if not args.spawn:
+        return run_dirdump_inline(argv)
+
+    if os.name == "posix":
+        # POSIX: fork + wait せず、このプロセスを dirdump に置き換える（戻らない）
+        # exec 前に print 済みの内容を捨てないよう flush しておく
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.execv(argv[0], argv)
+
     cp = subprocess.run(argv)
     return cp.returncode
 
 
+def run_dirdump_inline(argv: list[str]) -> int:
+    """
+    dirdump.main() を同じプロセスで呼ぶ（インタプリタ起動と再importを省く）。
+    argv は build_dirdump_argv() の戻り値（[python, dirdump.py, ...]）。
+    """
+    here = str(Path(__file__).resolve().parent)
+    if here not in sys.path:
+        sys.path.insert(0, here)
+    import dirdump
+
+    saved = sys.argv
+    sys.argv = argv[1:]
+    try:
+        return dirdump.main()
+    finally:
+        sys.argv = saved
+
+
 def build_dirdump_argv(args: argparse.Namespace, passthrough: list[str]) -> list[str]:
     here = Path(__file__).resolve().parent
     dirdump = here / "dirdump.py"
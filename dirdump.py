@@ -20,14 +20,23 @@
 from __future__ import annotations
 
 import argparse
+import codecs
+import functools
+import gzip
+import hashlib
 import mimetypes
 import os
 import shutil
+import stat
 import subprocess
 import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from itertools import islice
 from pathlib import Path
-from typing import Iterable, List, Optional, Sequence, Set, Tuple
-import re
+from typing import BinaryIO, Deque, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Union
 
 
 # -----------------------------
@@ -35,7 +44,7 @@ import re
 # -----------------------------
 
 # Exclude by directory name anywhere in path
-DEFAULT_EXCLUDE_NAMES: Set[str] = {
+DEFAULT_EXCLUDE_NAMES: FrozenSet[str] = frozenset({
     ".git",
     "vendor",
     "node_modules",
@@ -49,7 +58,7 @@ DEFAULT_EXCLUDE_NAMES: Set[str] = {
     "coverage",
     ".cache",
     ".DS_Store",
-}
+})
 
 # Exclude by relative path prefix from target_dir (useful for nested dirs)
 DEFAULT_EXCLUDE_PREFIXES: Tuple[str, ...] = (
@@ -78,38 +87,121 @@ BINARY_EXT_BLACKLIST: Set[str] = {
     ".psd", ".ai", ".sketch", ".sql", ".log",
 }
 
+# Code fence language by extension (md output)
+LANG_BY_SUFFIX: Dict[str, str] = {
+    ".php": "php",
+    ".twig": "twig",
+    ".html": "html", ".htm": "html",
+    ".js": "javascript", ".jsx": "javascript",
+    ".ts": "typescript", ".tsx": "typescript",
+    ".css": "css",
+    ".scss": "scss", ".sass": "scss",
+    ".yml": "yaml", ".yaml": "yaml",
+    ".md": "markdown",
+    ".json": "json",
+    ".sql": "sql",
+    ".xml": "xml",
+    ".ps1": "powershell",
+    ".sh": "bash", ".bash": "bash", ".zsh": "bash",
+}
+
+# Suffixes known to be text: no mimetype lookup for these
+# (also keeps e.g. .ts from being taken as video/mp2t on some systems)
+KNOWN_TEXT_SUFFIXES: FrozenSet[str] = frozenset(
+    [x for x in DEFAULT_TEXT_EXTS.split(",") if x.count(".") == 1] + list(LANG_BY_SUFFIX)
+)
+
 # For mimetype-based binary filtering
 BINARY_MIME_PREFIXES = ("image/", "audio/", "video/")
 BINARY_MIME_EXACT = {"application/pdf", "application/zip"}
 
+# How many leading bytes are sniffed for binary detection
+SNIFF_BYTES = 8192
+
+# One file section, built with a single % per file:
+# (name, path, lang, content, nl) for md / (name, path, content, nl) for txt
+SECTION_TMPL_MD = "ファイル名:%s\nパス:%s\n内容\n```%s\n%s%s```\n\n---\n\n"
+SECTION_TMPL_TXT = "ファイル名:%s\nパス:%s\n内容\n%s%s\n---\n\n"
+
+# Files read ahead of the writer per --jobs worker (read_texts)
+READ_AHEAD_PER_JOB = 4
+
+# Default --jobs: more threads than this rarely helps file I/O
+DEFAULT_MAX_JOBS = 8
+
+# --cache: <user cache dir>/dirdump; bump CACHE_VERSION when decoding changes
+CACHE_DIR_NAME = "dirdump"
+CACHE_VERSION = 1
+# entries older than this are removed (checked at most once per CACHE_PRUNE_INTERVAL)
+CACHE_MAX_AGE = 30 * 24 * 3600
+CACHE_PRUNE_INTERVAL = 24 * 3600
+CACHE_PRUNE_STAMP = ".last-prune"
+# the cache holds copies of dumped files (.env etc.): owner-only
+CACHE_DIR_MODE = 0o700
+CACHE_FILE_MODE = 0o600
+
+# Output file buffer size (SplitWriter)
+WRITE_BUFFER_BYTES = 1 << 20
+
+# Bytes < 0x80; deleting them leaves the ">= 0x80" bytes counted as
+# "non-text" by the binary ratio heuristic
+_ASCII_BYTES = bytes(range(0x80))
+
 
 # -----------------------------
 # Helpers
 # -----------------------------
 
-def _to_posix_parts(p: Path) -> Tuple[str, ...]:
-    # Normalize to forward-slash semantics
-    return tuple(Path(p.as_posix()).parts)
+def _suffix_lower(name_lower: str) -> str:
+    # Same as Path(name).suffix, without building a Path
+    dot = name_lower.rfind(".")
+    if 0 < dot < len(name_lower) - 1:
+        return name_lower[dot:]
+    return ""
 
-def parse_exts(ext_csv: str) -> Tuple[str, ...]:
-    items = []
+def parse_exts(ext_csv: str) -> Tuple[FrozenSet[str], Tuple[str, ...]]:
+    """
+    Returns:
+      - exts: frozenset of lowercased extensions (O(1) membership per file)
+      - multi_exts: the multi-dot ones (e.g. .blade.php), matched with endswith
+    """
+    items: Set[str] = set()
     for raw in ext_csv.split(","):
         s = raw.strip()
         if not s:
             continue
         if not s.startswith(".") and s not in (".env", ".gitignore", ".editorconfig", ".gitattributes"):
             s = "." + s
-        items.append(s.lower())
-    return tuple(dict.fromkeys(items))  # preserve order, unique
+        items.add(s.lower())
+    # only membership / endswith is used downstream, so no order to keep
+    # (multi_exts sorted just to stay deterministic)
+    return frozenset(items), tuple(sorted(s for s in items if s.count(".") > 1))
+
+def ext_matches(name_lower: str, exts: FrozenSet[str], multi_exts: Tuple[str, ...]) -> bool:
+    """
+    Extension filter for --ext mode (name_lower: lowercased file name).
+    """
+    for ms in multi_exts:
+        if name_lower.endswith(ms):
+            return True
+    # blade templates are only picked when .blade.php itself is listed
+    if name_lower.endswith(".blade.php"):
+        return False
+    return _suffix_lower(name_lower) in exts
+
+def _prefix_posix(token: str) -> str:
+    # "./src//Legacy/" -> "src/Legacy"
+    return "/".join([p for p in token.replace("\\", "/").split("/") if p not in ("", ".")])
 
-def parse_excludes(exclude_csv: str) -> Tuple[Set[str], Tuple[Tuple[str, ...], ...]]:
+def parse_excludes(exclude_csv: str) -> Tuple[FrozenSet[str], Tuple[str, ...]]:
     """
     Returns:
-      - exclude_names: set of directory names to skip anywhere
-      - exclude_prefix_parts: tuple of path-part tuples representing prefixes relative to target_dir
+      - exclude_names: frozenset of directory names to skip anywhere
+      - exclude_prefixes: normalized posix prefixes relative to target_dir
+        (e.g. "bootstrap/cache"; no "." / empty parts, no trailing slash)
     """
     exclude_names = set(DEFAULT_EXCLUDE_NAMES)
-    prefixes: List[Tuple[str, ...]] = [tuple(Path(x).as_posix().split("/")) for x in DEFAULT_EXCLUDE_PREFIXES]
+    prefixes: List[str] = [_prefix_posix(x) for x in DEFAULT_EXCLUDE_PREFIXES]
 
     if exclude_csv.strip():
         for raw in exclude_csv.split(","):
@@ -118,172 +210,357 @@ def parse_excludes(exclude_csv: str) -> Tuple[Set[str], Tuple[Tuple[str, ...], .
                 continue
             token = token.replace("\\", "/")
             if "/" in token:
-                parts = tuple([p for p in token.split("/") if p])
-                if parts:
-                    prefixes.append(parts)
+                prefixes.append(_prefix_posix(token))
             else:
                 exclude_names.add(token)
 
-    # De-dup prefixes while keeping order
+    # De-dup prefixes while keeping order (normalized once here, not per file)
     seen = set()
-    uniq: List[Tuple[str, ...]] = []
+    uniq: List[str] = []
     for p in prefixes:
-        if p not in seen:
+        if p and p not in seen:
             seen.add(p)
             uniq.append(p)
-    return exclude_names, tuple(uniq)
+    return frozenset(exclude_names), tuple(uniq)
 
-def is_excluded_rel(
-    rel_parts: Tuple[str, ...],
-    exclude_names: Set[str],
-    exclude_prefixes: Tuple[Tuple[str, ...], ...],
+def is_excluded_rel_str(
+    rel_posix: str,
+    exclude_names: FrozenSet[str],
+    exclude_prefixes: Tuple[str, ...],
 ) -> bool:
-    # ディレクトリ名除外（どこにあっても）
-    for part in rel_parts[:-1]:
-        if part in exclude_names:
-            return True
+    """
+    Exclusion check for a normalized posix path relative to target_dir
+    (e.g. "app/Http/Kernel.php"); split only for the directory-name check.
+    """
+    # ディレクトリ名除外（どこにあっても）: the leaf itself is not checked
+    dir_posix, sep, _ = rel_posix.rpartition("/")
+    if sep and not exclude_names.isdisjoint(dir_posix.split("/")):
+        return True
 
     # パスprefix除外（target_dir からの相対パスとして判定）
-    rel_posix = "/".join([p for p in rel_parts if p not in ("", ".")])
-
     for pref in exclude_prefixes:
-        pref_posix = "/".join([p for p in pref if p not in ("", ".")])
-        if not pref_posix:
-            continue
-
         # rel_posix が prefix 自体 or prefix配下 なら除外
-        if rel_posix == pref_posix or rel_posix.startswith(pref_posix + "/"):
+        if rel_posix == pref or rel_posix.startswith(pref + "/"):
             return True
 
     return False
 
+# Both are probed more than once per run; PATH scans are slow (esp. on Windows)
+@functools.lru_cache(maxsize=None)
 def is_git_repo(project_dir: Path) -> bool:
     return (project_dir / ".git").exists()
 
+@functools.lru_cache(maxsize=1)
 def which_git() -> Optional[str]:
     return shutil.which("git")
 
-def git_ls_files(project_dir: Path, target_rel_posix: str) -> List[str]:
+def git_ls_files(
+    project_dir: Path, target_rel_posix: str, include_untracked: bool = False
+) -> List[str]:
     """
     Return git-tracked file paths (posix-like) under target_rel_posix.
+    Uses -z (NUL separated, no path quoting) so names with newlines or
+    non-ASCII characters come back verbatim.
+    include_untracked=True also lists untracked, non-ignored files
+    (--cached --others --exclude-standard) in the same git call.
     """
     git = which_git()
     if not git:
         return []
-    cmd = [git, "-C", str(project_dir), "ls-files", target_rel_posix]
+    cmd = [git, "-C", str(project_dir), "ls-files", "-z"]
+    if include_untracked:
+        # no --modified/--deleted: without --stage they only repeat --cached entries
+        cmd += ["--cached", "--others", "--exclude-standard"]
+    # "--": a target named like an option is still a pathspec
+    cmd += ["--", target_rel_posix]
     try:
-        out = subprocess.check_output(cmd, stderr=subprocess.DEVNULL, text=True)
-    except Exception:
+        proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=False)
+    except OSError:
+        return []
+    if proc.returncode != 0:
         return []
-    return [line for line in out.splitlines() if line.strip()]
+    return [os.fsdecode(p) for p in proc.stdout.split(b"\x00") if p]
+
+# _classify_suffix() results
+SUFFIX_UNKNOWN = 0
+SUFFIX_BINARY_EXT = 1
+SUFFIX_BINARY_MIME = 2
+SUFFIX_TEXT_HINT = 3
 
-def looks_binary(path: Path, sniff_bytes: int = 8192) -> bool:
+@functools.lru_cache(maxsize=1024)
+def _classify_suffix(suf: str) -> int:
     """
-    Heuristic binary detector:
-    - extension blacklist (fast)
-    - mimetype hint (image/audio/video/pdf/zip etc.)
-    - NUL byte presence
-    - high ratio of non-text bytes
+    Classify a lowercased suffix (".png", "" ...) by name only:
+    extension blacklist, known text suffixes, then the mimetype hint
+    (image/audio/video/pdf/zip etc.).
+    Cached: a tree has only a few dozen distinct suffixes.
     """
-    suf = path.suffix.lower()
     if suf in BINARY_EXT_BLACKLIST:
-        return True
-
-    mt, _ = mimetypes.guess_type(str(path))
-    if mt:
-        if mt.startswith(BINARY_MIME_PREFIXES):
-            return True
-        if mt in BINARY_MIME_EXACT:
-            return True
-
-    try:
-        data = path.read_bytes()[:sniff_bytes]
-    except Exception:
-        return True
+        return SUFFIX_BINARY_EXT
+    # no mimetype lookup for suffixes we already know to be text
+    if suf in KNOWN_TEXT_SUFFIXES:
+        return SUFFIX_TEXT_HINT
+    mt, _ = mimetypes.guess_type("x" + suf)
+    if mt and (mt.startswith(BINARY_MIME_PREFIXES) or mt in BINARY_MIME_EXACT):
+        return SUFFIX_BINARY_MIME
+    return SUFFIX_UNKNOWN
+
+def _binary_by_name(name_lower: str) -> bool:
+    """
+    Binary by file name alone (extension blacklist / mimetype hint).
+    No syscalls; collectors call this so such files are never opened.
+    """
+    cls = _classify_suffix(_suffix_lower(name_lower))
+    return cls == SUFFIX_BINARY_EXT or cls == SUFFIX_BINARY_MIME
 
+def _binary_by_content(data: bytes) -> bool:
+    """
+    Heuristic binary detector on already-read head bytes:
+    - NUL byte presence
+    - high ratio of non-text bytes
+    """
     if b"\x00" in data:
         return True
 
     # Non-text-ish ratio heuristic (len>=512 to avoid tiny false positives)
-    if len(data) >= 512:
-        # Define "text-like" bytes: common ASCII printable + whitespace + common controls
-        text_like = set(range(32, 127)) | {9, 10, 13, 8}
-        nontext = 0
-        for b in data:
-            if b in text_like:
-                continue
-            # bytes >= 0x80 might be UTF-8 multibyte; don't count as nontext immediately.
-            # But if file is truly binary, it'll have lots of random >=0x80.
-            if b >= 0x80:
-                nontext += 1
+    # (pure ASCII heads — most source files — have no high bytes at all)
+    if len(data) >= 512 and not data.isascii():
+        # bytes >= 0x80 might be UTF-8 multibyte; don't count as nontext immediately.
+        # But if file is truly binary, it'll have lots of random >=0x80.
+        # (count them in C: translate() deletes everything below 0x80)
+        nontext = len(data.translate(None, _ASCII_BYTES))
         if (nontext / max(1, len(data))) > 0.30:
             return True
 
     return False
 
-def safe_read_text(path: Path) -> Optional[str]:
+def _read_sniffed(f: BinaryIO) -> Optional[bytearray]:
+    """
+    Read an open file into one buffer sized from fstat, sniffing the head
+    first. Returns None (without reading the rest) if the head looks binary.
+    Avoids the extra full copy of `head + f.read()`.
+    The buffer has one spare byte: reads continue until readinto() returns 0
+    (a short read is not EOF: large files / network mounts return partial
+    reads), or until the spare byte is filled, i.e. the file grew since
+    fstat, in which case the rest is read with f.read().
+    """
+    size = os.fstat(f.fileno()).st_size
+    buf = bytearray(size + 1)
+    view = memoryview(buf)
+    try:
+        # head: fill up to SNIFF_BYTES (or the whole file) before sniffing
+        want = min(SNIFF_BYTES, len(buf))
+        n = 0
+        eof = False
+        while n < want:
+            got = f.readinto(view[n:want])
+            if not got:
+                eof = True
+                break
+            n += got
+        if _binary_by_content(bytes(view[:n])):
+            return None
+
+        # rest of the file into the same buffer
+        while not eof and n < len(buf):
+            got = f.readinto(view[n:])
+            if not got:
+                eof = True
+                break
+            n += got
+    finally:
+        view.release()
+
+    del buf[n:]
+    if not eof:
+        # spare byte filled: file has grown since fstat
+        buf += f.read()
+    return buf
+
+def safe_read_text(path: Union[str, Path], check_name: bool = True) -> Optional[str]:
     """
     Read as text safely. Returns None if looks binary or unreadable.
+    check_name=False skips _binary_by_name() when the caller already
+    filtered by name (walk_collect_files / git_collect_files do).
+    The file is opened once and read into a single buffer (see _read_sniffed).
     Encoding strategy:
+      - utf-8-sig (when the file starts with a BOM; BOM is stripped)
       - utf-8
-      - utf-8-sig
       - cp932 (Windows legacy)
       - fallback utf-8 replace
     """
-    if looks_binary(path):
+    try:
+        return _read_text(path, check_name)
+    except Exception:
+        return None
+
+def _read_text(path: Union[str, Path], check_name: bool) -> Optional[str]:
+    """
+    safe_read_text() without the catch-all: None means "binary", while
+    open/read failures raise (cached_read_text must not cache those).
+    """
+    if check_name and _binary_by_name(os.path.basename(path).lower()):
         return None
 
+    # unbuffered: readinto() goes straight to read(2) into our buffer, and
+    # open() skips the isatty()/tell() probes a BufferedReader makes
+    with open(path, "rb", buffering=0) as f:
+        raw = _read_sniffed(f)
+    if raw is None:
+        return None
+
+    # BOM is decided by the first 3 bytes; no need to try/fail utf-8-sig
+    if raw.startswith(codecs.BOM_UTF8):
+        # str() over a memoryview: decode past the BOM without slicing a copy
+        return str(memoryview(raw)[len(codecs.BOM_UTF8):], "utf-8", "replace")
+
     try:
-        raw = path.read_bytes()
-    except Exception:
+        return raw.decode("utf-8")
+    except UnicodeDecodeError:
+        pass
+
+    try:
+        return raw.decode("cp932")
+    except UnicodeDecodeError:
+        return raw.decode("utf-8", errors="replace")
+
+def default_cache_dir() -> Path:
+    # %LOCALAPPDATA% on Windows, $XDG_CACHE_HOME or ~/.cache elsewhere
+    base = os.environ.get("LOCALAPPDATA" if os.name == "nt" else "XDG_CACHE_HOME")
+    return (Path(base) if base else Path.home() / ".cache") / CACHE_DIR_NAME
+
+def cached_read_text(path: str, cache_dir: Path, check_name: bool = True) -> Optional[str]:
+    """
+    safe_read_text() through an on-disk cache (--cache).
+    Key: blake2b of (path, mtime_ns, size), so an unchanged file costs one
+    stat + one small gzip read. Entries hold the decoded text gzipped; an
+    empty entry means "binary". Files that could not be read are not cached
+    (the failure may be transient). Cache errors are ignored.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
         return None
+    ident = f"{CACHE_VERSION}\0{int(check_name)}\0{path}\0{st.st_mtime_ns}\0{st.st_size}"
+    key = hashlib.blake2b(ident.encode("utf-8", "surrogateescape"), digest_size=20).hexdigest()
+    entry = os.path.join(cache_dir, key[:2], key)
 
-    for enc in ("utf-8", "utf-8-sig", "cp932"):
+    try:
+        with open(entry, "rb") as f:
+            data = f.read()
+    except OSError:
+        pass
+    else:
+        if not data:
+            return None
         try:
-            return raw.decode(enc)
+            return gzip.decompress(data).decode("utf-8")
         except Exception:
-            pass
+            pass  # broken entry: read again and overwrite
 
     try:
-        return raw.decode("utf-8", errors="replace")
+        content = _read_text(path, check_name)
     except Exception:
         return None
 
-def language_from_path(p: Path) -> str:
-    name = p.name.lower()
-    suf = p.suffix.lower()
+    # write + rename, so a concurrent run never sees a half-written entry
+    tmp = f"{entry}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(cache_dir, mode=CACHE_DIR_MODE, exist_ok=True)
+        os.makedirs(os.path.dirname(entry), mode=CACHE_DIR_MODE, exist_ok=True)
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), CACHE_FILE_MODE)
+        with open(fd, "wb") as f:
+            if content is not None:
+                f.write(gzip.compress(content.encode("utf-8"), compresslevel=1))
+        os.replace(tmp, entry)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+    return content
+
+def prune_cache(cache_dir: Path, max_age: int = CACHE_MAX_AGE) -> None:
+    """
+    Remove cache entries (and leftover .tmp files) older than max_age seconds.
+    Runs at most once per CACHE_PRUNE_INTERVAL (stamp file in cache_dir),
+    so a normal --cache run does not walk the whole cache. Errors are ignored.
+    """
+    stamp = os.path.join(cache_dir, CACHE_PRUNE_STAMP)
+    now = time.time()
+    try:
+        if now - os.stat(stamp).st_mtime < CACHE_PRUNE_INTERVAL:
+            return
+    except OSError:
+        pass  # no stamp yet: prune (also creates it)
+
+    cutoff = now - max_age
+    try:
+        # first run: create the (owner-only) dir so the stamp below can be written
+        os.makedirs(cache_dir, mode=CACHE_DIR_MODE, exist_ok=True)
+        with os.scandir(cache_dir) as buckets:
+            for bucket in buckets:
+                if not bucket.is_dir(follow_symlinks=False):
+                    continue
+                with os.scandir(bucket.path) as entries:
+                    for e in entries:
+                        try:
+                            if e.stat(follow_symlinks=False).st_mtime < cutoff:
+                                os.unlink(e.path)
+                        except OSError:
+                            pass
+    except OSError:
+        pass
+
+    try:
+        os.close(os.open(stamp, os.O_WRONLY | os.O_CREAT, CACHE_FILE_MODE))
+        os.utime(stamp)
+    except OSError:
+        pass
+
+def read_texts(
+    files: Sequence[str],
+    jobs: int,
+    check_name: bool = True,
+    cache_dir: Optional[Path] = None,
+) -> Iterator[Tuple[str, Optional[str]]]:
+    """
+    safe_read_text() over files, yielding (path, content) in input order.
+    With cache_dir, reads go through cached_read_text().
+    With jobs > 1 the reads (I/O bound) run on a thread pool, at most
+    jobs * READ_AHEAD_PER_JOB files ahead of the caller (so a slow writer
+    doesn't pile up the whole tree in memory); results are consumed in
+    order, so the output stays identical.
+    """
+    def read(p: str) -> Optional[str]:
+        if cache_dir is not None:
+            return cached_read_text(p, cache_dir, check_name)
+        return safe_read_text(p, check_name)
 
+    if jobs <= 1:
+        for p in files:
+            yield p, read(p)
+        return
+
+    window = jobs * READ_AHEAD_PER_JOB
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        it = iter(files)
+        ahead: Deque[Tuple[str, Future]] = deque()
+        for p in islice(it, window):
+            ahead.append((p, pool.submit(read, p)))
+        while ahead:
+            p, fut = ahead.popleft()
+            # refill before blocking on the head, so the pool stays busy
+            nxt = next(it, None)
+            if nxt is not None:
+                ahead.append((nxt, pool.submit(read, nxt)))
+            yield p, fut.result()
+
+def language_from_name(name: str) -> str:
+    # name: lowercased file name
     if name.endswith(".blade.php"):
         return "php"
-    if suf == ".php":
-        return "php"
-    if suf == ".twig":
-        return "twig"
-    if suf in (".html", ".htm"):
-        return "html"
-    if suf in (".js", ".jsx"):
-        return "javascript"
-    if suf in (".ts", ".tsx"):
-        return "typescript"
-    if suf in (".css",):
-        return "css"
-    if suf in (".scss", ".sass"):
-        return "scss"
-    if suf in (".yml", ".yaml"):
-        return "yaml"
-    if suf in (".md",):
-        return "markdown"
-    if suf in (".json",):
-        return "json"
-    if suf in (".sql",):
-        return "sql"
-    if suf in (".xml",):
-        return "xml"
-    if suf in (".ps1",):
-        return "powershell"
-    if suf in (".sh", ".bash", ".zsh"):
-        return "bash"
-    return ""
+    return LANG_BY_SUFFIX.get(_suffix_lower(name), "")
 
 def normalize_target(project_dir: Path, target: str) -> Path:
     target_in = Path(target).expanduser()
@@ -302,68 +579,283 @@ def default_output_path(project_dir: Path, target_dir: Path) -> Path:
 # Walking and structure output
 # -----------------------------
 
-def walk_collect_files(
+def _tree_key(entry: os.DirEntry) -> str:
+    # Sibling order for the structure: by name, dirs as "name/".
+    # A depth-first walk in this order lists paths exactly as a plain sort
+    # of the full rel paths ("a.txt" < "a/" < "a/x" < "a0"), without the sort.
+    return entry.name + "/" if entry.is_dir() else entry.name
+
+def _normalize_prefixes(exclude_prefixes: Tuple[str, ...]) -> Tuple[Tuple[str, ...], ...]:
+    # Split once, so the walkers can compare parts by depth
+    return tuple([tuple(pref.split("/")) for pref in exclude_prefixes])
+
+def _descend_prefixes(
+    live_prefixes: Tuple[Tuple[str, ...], ...],
+    depth: int,
+    name: str,
+) -> Tuple[Tuple[Tuple[str, ...], ...], bool]:
+    """
+    Narrow live_prefixes (prefixes still matching the path so far) by the
+    child `name` at `depth`.
+    Returns (prefixes still live under the child, child itself is excluded).
+    """
+    if not live_prefixes:
+        return live_prefixes, False
+
+    narrowed: List[Tuple[str, ...]] = []
+    for pref in live_prefixes:
+        if pref[depth] != name:
+            continue
+        if len(pref) == depth + 1:
+            return (), True
+        narrowed.append(pref)
+    return tuple(narrowed), False
+
+# A pending directory for walk_once: (abs_path, rel_posix, depth, live_prefixes)
+_DirTask = Tuple[str, str, int, Tuple[Tuple[str, ...], ...]]
+
+# One listed entry: (name, is_dir, task to descend into or None)
+_DirEntryRow = Tuple[str, bool, Optional[_DirTask]]
+
+# Parallel walk only pays off for trees that fan out: levels are scanned
+# serially until the frontier has at least max(jobs, this) directories
+PARALLEL_WALK_MIN_SUBDIRS = 4
+
+def walk_once(
     target_dir: Path,
-    exts: Tuple[str, ...],
-    exclude_names: Set[str],
-    exclude_prefixes: Tuple[Tuple[str, ...], ...],
-    all_text: bool,
-) -> List[Path]:
-    files: List[Path] = []
-
-    for root, dirs, filenames in os.walk(target_dir):
-        root_path = Path(root)
-        rel_root = root_path.relative_to(target_dir)
-        rel_root_parts = _to_posix_parts(rel_root)
-
-        # prune directories
-        kept_dirs: List[str] = []
-        for d in dirs:
-            if d in exclude_names:
-                continue
-            rel_dir_parts = rel_root_parts + (d,)
-            if is_excluded_rel(rel_dir_parts, exclude_names, exclude_prefixes):
-                continue
-            kept_dirs.append(d)
-        dirs[:] = sorted(kept_dirs)
+    exclude_names: FrozenSet[str],
+    exclude_prefixes: Tuple[str, ...],
+    exts: FrozenSet[str] = frozenset(),
+    multi_exts: Tuple[str, ...] = (),
+    all_text: bool = False,
+    collect_files: bool = True,
+    with_structure: bool = True,
+    max_entries: int = 0,
+    include_excluded: bool = True,
+    follow_symlinks: bool = False,
+    jobs: int = 1,
+    with_sizes: bool = True,
+) -> Tuple[List[Tuple[str, str, int]], List[str]]:
+    """
+    One recursive os.scandir pass over target_dir that produces both:
+      - files: (abs_path, rel_posix, size) tuples, sorted by rel_posix
+        (same filters as walk_collect_files)
+      - structure lines (same listing as build_structure_lines)
+    so a filesystem-walk dump doesn't traverse the tree twice.
+
+    - Excluded dirs are NOT traversed (shown as a single entry if include_excluded).
+    - Symlinked dirs are listed but not descended (same as os.walk).
+    - max_entries only limits the structure; file collection continues.
+    - with_sizes=False skips the per-file stat() (size is reported as 0);
+      the type checks come from the scandir entry itself.
+    - The structure is emitted depth-first with siblings in _tree_key order,
+      which is already sorted; there is no final sort over all entries.
+    - With jobs > 1 (and no max_entries, which may stop the walk early)
+      the top levels are scanned serially until the frontier is wide enough
+      (a narrow root like src/ or app/ is descended first), then the rest
+      is scanned on a thread pool; the scanned listings are then emitted in
+      the same depth-first order.
+    """
+    files: List[Tuple[str, str, int]] = []
+    lines: List[str] = [f"{target_dir.name}/"] if with_structure else []
+    truncated = False
+
+    def scan_dir(
+        root: str,
+        rel_posix: str,
+        depth: int,
+        live_prefixes: Tuple[Tuple[str, ...], ...],
+    ) -> Tuple[List[_DirEntryRow], List[Tuple[str, str, int]], List[_DirTask]]:
+        """
+        Lists one directory. Returns (structure rows in tree order,
+        collected files, subdirectories to descend). No shared state, so
+        it can run on any thread.
+        """
+        rows: List[_DirEntryRow] = []
+        dir_files: List[Tuple[str, str, int]] = []
+        subdirs: List[_DirTask] = []
+
+        try:
+            with os.scandir(root) as it:
+                listing = sorted(it, key=_tree_key)
+        except OSError:
+            return rows, dir_files, subdirs
+
+        base = rel_posix + "/" if rel_posix else ""
+
+        for entry in listing:
+            name = entry.name
+
+            if entry.is_dir():
+                # cheap name check first; prefixes only when the name survives
+                excluded = name in exclude_names
+                if not excluded:
+                    child_live, excluded = _descend_prefixes(live_prefixes, depth, name)
+                if excluded:
+                    # show excluded (optionally) but don't traverse
+                    if with_structure and include_excluded:
+                        rows.append((name, True, None))
+                    continue
 
-        # collect files
-        for fn in sorted(filenames):
-            p = root_path / fn
-            if not p.is_file():
+                sub: Optional[_DirTask] = None
+                if not entry.is_symlink():
+                    sub = (entry.path, base + name, depth + 1, child_live)
+                    subdirs.append(sub)
+                rows.append((name, True, sub))
                 continue
 
-            rel = p.relative_to(target_dir)
-            rel_parts = _to_posix_parts(rel)
-            if is_excluded_rel(rel_parts, exclude_names, exclude_prefixes):
+            # --- files
+            _, excluded = _descend_prefixes(live_prefixes, depth, name)
+            if excluded:
                 continue
 
-            if all_text:
-                # include everything for now; binary will be filtered by safe_read_text()
-                files.append(p.resolve())
-            else:
-                name_lower = p.name.lower()
-                if name_lower.endswith(".blade.php"):
-                    if ".blade.php" in exts:
-                        files.append(p.resolve())
+            if with_structure:
+                rows.append((name, False, None))
+            if not collect_files:
+                continue
+            # name filters first: is_file() may need a stat (no d_type on some filesystems)
+            name_lower = name.lower()
+            if not all_text and not ext_matches(name_lower, exts, multi_exts):
+                continue
+            # known binary by name never gets opened (content sniff happens later);
+            # also applies to the ext whitelist (e.g. .sql is in both lists)
+            if _binary_by_name(name_lower):
+                continue
+            if not entry.is_file():
+                continue
+            size = 0
+            if with_sizes:
+                try:
+                    size = entry.stat().st_size
+                except OSError:
                     continue
-                if p.suffix.lower() in exts:
-                    files.append(p.resolve())
+            dir_files.append((entry.path, base + name, size))
+
+        return rows, dir_files, subdirs
 
-    # stable ordering
-    files.sort(key=lambda x: x.relative_to(target_dir).as_posix())
+    def emit(task: _DirTask, listed: Dict[str, Tuple[List[_DirEntryRow], List[Tuple[str, str, int]]]]) -> None:
+        # depth-first: a dir's line is followed by its subtree, so the
+        # structure comes out in order (and --structure-max cuts a prefix of it)
+        nonlocal truncated
+        got = listed.pop(task[1], None)
+        if got is None:
+            rows, dir_files, _ = scan_dir(*task)
+        else:
+            rows, dir_files = got
+        files.extend(dir_files)
+
+        indent = "  " * task[2]
+        for name, is_dir, sub in rows:
+            if not truncated and with_structure:
+                lines.append(f"{indent}{name}/" if is_dir else f"{indent}{name}")
+                if max_entries and len(lines) > max_entries:
+                    truncated = True
+            elif not collect_files:
+                return
+            if sub is not None:
+                emit(sub, listed)
+
+    root_task: _DirTask = (os.fspath(target_dir), "", 0, _normalize_prefixes(exclude_prefixes))
+    # rel_posix -> (rows, files) of directories already scanned on the pool
+    listed: Dict[str, Tuple[List[_DirEntryRow], List[Tuple[str, str, int]]]] = {}
+    if jobs > 1 and not max_entries:
+        # breadth-first, serially, while the frontier is narrower than the pool
+        min_fanout = max(jobs, PARALLEL_WALK_MIN_SUBDIRS)
+        frontier: List[_DirTask] = [root_task]
+        while frontier and len(frontier) < min_fanout:
+            next_frontier: List[_DirTask] = []
+            for task in frontier:
+                rows, dir_files, subdirs = scan_dir(*task)
+                listed[task[1]] = (rows, dir_files)
+                next_frontier.extend(subdirs)
+            frontier = next_frontier
+        if frontier:
+            with ThreadPoolExecutor(max_workers=jobs) as pool:
+                pending = {pool.submit(scan_dir, *sub): sub[1] for sub in frontier}
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        rel_posix = pending.pop(fut)
+                        rows, dir_files, subdirs = fut.result()
+                        listed[rel_posix] = (rows, dir_files)
+                        for sub in subdirs:
+                            pending[pool.submit(scan_dir, *sub)] = sub[1]
+    # (directories not scanned above are listed on the way)
+    emit(root_task, listed)
+
+    if follow_symlinks:
+        files = _resolve_inside(os.fspath(target_dir), files)
+    # stable ordering (already in order unless links were resolved)
+    files.sort(key=lambda x: x[1])
+
+    if truncated:
+        lines.append("  ...(structure truncated)...")
+    return files, lines
+
+def walk_collect_files(
+    target_dir: Path,
+    exts: FrozenSet[str],
+    multi_exts: Tuple[str, ...],
+    exclude_names: FrozenSet[str],
+    exclude_prefixes: Tuple[str, ...],
+    all_text: bool,
+    follow_symlinks: bool = False,
+) -> List[Tuple[str, str, int]]:
+    """
+    Returns (abs_path, rel_posix, size) tuples, sorted by rel_posix.
+    Paths stay plain str (no Path per file); the size comes from the
+    DirEntry stat, so main() doesn't need another stat() for --max-bytes.
+    """
+    files, _ = walk_once(
+        target_dir=target_dir,
+        exclude_names=exclude_names,
+        exclude_prefixes=exclude_prefixes,
+        exts=exts,
+        multi_exts=multi_exts,
+        all_text=all_text,
+        with_structure=False,
+        follow_symlinks=follow_symlinks,
+    )
     return files
 
+def _rel_under(base_str: str, abs_str: str) -> Optional[str]:
+    # posix rel path of abs_str under base_str, or None when outside
+    base_sep = os.path.join(base_str, "")
+    if not abs_str.startswith(base_sep):
+        return None
+    return abs_str[len(base_sep):].replace(os.sep, "/")
+
+def _resolve_inside(target_str: str, files: Iterable[Tuple[str, str, int]]) -> List[Tuple[str, str, int]]:
+    # --follow-symlinks: resolve links, keep only what still lives under target_dir
+    results: List[Tuple[str, str, int]] = []
+    seen: Set[str] = set()
+    for abs_str, _, size in files:
+        real = os.path.realpath(abs_str)
+        if real in seen:
+            continue
+        rel = _rel_under(target_str, real)
+        if rel is None:
+            continue
+        seen.add(real)
+        results.append((real, rel, size))
+    return results
+
 def git_collect_files(
     project_dir: Path,
     target_dir: Path,
-    exts: Tuple[str, ...],
-    exclude_names: Set[str],
-    exclude_prefixes: Tuple[Tuple[str, ...], ...],
+    exts: FrozenSet[str],
+    multi_exts: Tuple[str, ...],
+    exclude_names: FrozenSet[str],
+    exclude_prefixes: Tuple[str, ...],
     all_text: bool,
-) -> List[Path]:
+    follow_symlinks: bool = False,
+    include_untracked: bool = False,
+) -> List[Tuple[str, str, int]]:
     """
     Collect files using `git ls-files`, then apply extension/all_text + excludes.
+    Returns (abs_path, rel_posix, size) tuples like walk_collect_files().
+    Paths are joined under the (already resolved) project_dir; symlinks are
+    only resolved with follow_symlinks=True.
     """
     # relative target for git
     try:
@@ -375,45 +867,49 @@ def git_collect_files(
         # target is outside project; can't use git safely
         return []
 
-    paths = git_ls_files(project_dir, target_rel_posix)
-    results: List[Path] = []
+    paths = git_ls_files(project_dir, target_rel_posix, include_untracked)
+    project_str = os.fspath(project_dir)
+    target_str = os.fspath(target_dir)
+    results: List[Tuple[str, str, int]] = []
 
     for posix_path in paths:
-        abs_path = (project_dir / posix_path).resolve()
-        if not abs_path.is_file():
-            continue
+        abs_str = os.path.normpath(os.path.join(project_str, posix_path))
+        if follow_symlinks:
+            abs_str = os.path.realpath(abs_str)
 
         # Must be inside target_dir
-        try:
-            rel = abs_path.relative_to(target_dir)
-        except Exception:
+        rel = _rel_under(target_str, abs_str)
+        if rel is None:
             continue
 
-        rel_parts = _to_posix_parts(rel)
-        if is_excluded_rel(rel_parts, exclude_names, exclude_prefixes):
+        if is_excluded_rel_str(rel, exclude_names, exclude_prefixes):
             continue
 
-        if all_text:
-            # quick skip for known binary by ext (deep sniff happens later)
-            if abs_path.suffix.lower() in BINARY_EXT_BLACKLIST:
-                continue
-            results.append(abs_path)
-        else:
-            name_lower = abs_path.name.lower()
-            if name_lower.endswith(".blade.php"):
-                if ".blade.php" in exts:
-                    results.append(abs_path)
-                continue
-            if abs_path.suffix.lower() in exts:
-                results.append(abs_path)
+        name_lower = rel.rsplit("/", 1)[-1].lower()
+        if not all_text and not ext_matches(name_lower, exts, multi_exts):
+            continue
+        # known binary by name never gets opened (content sniff happens later);
+        # also applies to the ext whitelist (e.g. .sql is in both lists)
+        if _binary_by_name(name_lower):
+            continue
+
+        # one stat for both "is it a regular file" and its size
+        try:
+            st = os.stat(abs_str)
+        except OSError:
+            continue
+        if not stat.S_ISREG(st.st_mode):
+            continue
 
-    results.sort(key=lambda x: x.relative_to(target_dir).as_posix())
+        results.append((abs_str, rel, st.st_size))
+
+    results.sort(key=lambda x: x[1])
     return results
 
 def build_structure_lines(
     target_dir: Path,
-    exclude_names: Set[str],
-    exclude_prefixes: Tuple[Tuple[str, ...], ...],
+    exclude_names: FrozenSet[str],
+    exclude_prefixes: Tuple[str, ...],
     max_entries: int = 0,
     include_excluded: bool = True,
 ) -> List[str]:
@@ -422,88 +918,14 @@ def build_structure_lines(
     - Excluded dirs are NOT traversed.
     - If include_excluded=True, excluded dirs are still shown as a single entry.
     """
-    lines: List[str] = [f"{target_dir.name}/"]
-    entries: List[Tuple[str, bool]] = []
-
-    count = 0
-
-    def add_entry(rel_posix: str, is_dir: bool) -> None:
-        nonlocal count
-        entries.append((rel_posix, is_dir))
-        count += 1
-
-    for root, dirs, filenames in os.walk(target_dir):
-        root_path = Path(root)
-        rel_root = root_path.relative_to(target_dir)
-        rel_root_parts = _to_posix_parts(rel_root)
-
-        # --- dirs: show excluded (optionally) but don't traverse
-        kept_dirs: List[str] = []
-        for d in dirs:
-            rel_dir_parts = rel_root_parts + (d,)
-            excluded = (d in exclude_names) or is_excluded_rel(rel_dir_parts, exclude_names, exclude_prefixes)
-
-            if excluded:
-                if include_excluded:
-                    rel_dir = (root_path / d).relative_to(target_dir).as_posix() + "/"
-                    add_entry(rel_dir, True)
-                    if max_entries and count >= max_entries:
-                        break
-                # prune: do not descend
-                continue
-
-            kept_dirs.append(d)
-
-        if max_entries and count >= max_entries:
-            break
-
-        dirs[:] = sorted(kept_dirs)
-
-        # add non-excluded dirs to structure
-        for d in dirs:
-            rel_dir = (root_path / d).relative_to(target_dir).as_posix() + "/"
-            add_entry(rel_dir, True)
-            if max_entries and count >= max_entries:
-                break
-
-        if max_entries and count >= max_entries:
-            break
-
-        # --- files
-        for fn in sorted(filenames):
-            rel_file = (root_path / fn).relative_to(target_dir).as_posix()
-            rel_parts = tuple(Path(rel_file).parts)
-
-            if is_excluded_rel(rel_parts, exclude_names, exclude_prefixes):
-                continue
-
-            add_entry(rel_file, False)
-            if max_entries and count >= max_entries:
-                break
-
-        if max_entries and count >= max_entries:
-            break
-
-    entries.sort(key=lambda x: x[0])
-
-    for rel_posix, is_dir in entries:
-        rel_clean = rel_posix.rstrip("/")
-
-        if rel_clean in ("", "."):
-            continue
-
-        p_rel = Path(rel_clean)
-        parts = p_rel.parts
-        if not parts:
-            continue
-
-        indent = "  " * (len(parts) - 1) if len(parts) > 1 else ""
-        name = p_rel.name + ("/" if is_dir else "")
-        lines.append(f"{indent}{name}")
-
-    if max_entries and count >= max_entries:
-        lines.append("  ...(structure truncated)...")
-
+    _, lines = walk_once(
+        target_dir=target_dir,
+        exclude_names=exclude_names,
+        exclude_prefixes=exclude_prefixes,
+        collect_files=False,
+        max_entries=max_entries,
+        include_excluded=include_excluded,
+    )
     return lines
 
 
@@ -549,11 +971,28 @@ def main() -> int:
     # Git / walk behavior
     parser.add_argument("--all-files", action="store_true",
                         help="Walk filesystem instead of using git tracked list (even if git repo).")
+    parser.add_argument("--include-untracked", action="store_true",
+                        help="Git mode: also include untracked files that are not ignored (.gitignore etc.).")
+    parser.add_argument("--follow-symlinks", action="store_true",
+                        help="Resolve symlinked files to their real path (links leading outside target are skipped).")
 
     # Size control
     parser.add_argument("--max-bytes", type=int, default=0,
                         help="Skip files larger than this size in bytes (0 = no limit).")
 
+    # Parallel walk / read
+    parser.add_argument("--jobs", type=int, default=0,
+                        help="Threads used to walk directories and read/decode files "
+                             "(0 = CPU count, up to 8; 1 = no threads). "
+                             "Output order is unchanged.")
+
+    # Content cache between runs
+    parser.add_argument("--cache", action=argparse.BooleanOptionalAction, default=False,
+                        help="Cache decoded file contents in the user cache dir "
+                             "($XDG_CACHE_HOME or ~/.cache, %%LOCALAPPDATA%% on Windows)/dirdump, "
+                             "keyed by path + mtime + size, so unchanged files are not re-read on re-runs. "
+                             "Entries older than 30 days are removed.")
+
     # Structure control
     parser.add_argument("--no-structure", action="store_true",
                         help="Do not output structure listing.")
@@ -580,7 +1019,7 @@ def main() -> int:
     exclude_names, exclude_prefixes = parse_excludes(args.exclude)
 
     # Extensions
-    exts = parse_exts(args.ext)
+    exts, multi_exts = parse_exts(args.ext)
 
     # Output path default
     if args.output_path:
@@ -591,6 +1030,8 @@ def main() -> int:
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
+    jobs = args.jobs if args.jobs > 0 else min(DEFAULT_MAX_JOBS, os.cpu_count() or 1)
+
     split_limit = 0
     if args.split_bytes > 0:
         split_limit = args.split_bytes
@@ -600,108 +1041,130 @@ def main() -> int:
     # Collect files: git-tracked by default if repo and target inside project, unless --all-files
     use_git = (is_git_repo(project_dir) and not args.all_files and which_git() is not None)
 
-    files: List[Path] = []
+    files: List[Tuple[str, str, int]] = []
+    structure_lines: Optional[List[str]] = None
     if use_git:
         files = git_collect_files(
             project_dir=project_dir,
             target_dir=target_dir,
             exts=exts,
+            multi_exts=multi_exts,
             exclude_names=exclude_names,
             exclude_prefixes=exclude_prefixes,
             all_text=args.all_text,
+            follow_symlinks=args.follow_symlinks,
+            include_untracked=args.include_untracked,
         )
-        if not files:
-            # fallback
-            files = walk_collect_files(
-                target_dir=target_dir,
-                exts=exts,
-                exclude_names=exclude_names,
-                exclude_prefixes=exclude_prefixes,
-                all_text=args.all_text,
-            )
-    else:
-        files = walk_collect_files(
+
+    if not files:
+        # filesystem walk (or fallback from git): collect files + structure in one pass
+        files, structure_lines = walk_once(
             target_dir=target_dir,
-            exts=exts,
             exclude_names=exclude_names,
             exclude_prefixes=exclude_prefixes,
+            exts=exts,
+            multi_exts=multi_exts,
             all_text=args.all_text,
+            with_structure=not args.no_structure,
+            max_entries=args.structure_max,
+            include_excluded=True,
+            follow_symlinks=args.follow_symlinks,
+            jobs=jobs,
+            # sizes are only needed for --max-bytes
+            with_sizes=bool(args.max_bytes),
         )
 
     # Write (force LF newlines for consistent dumps)
-    fence = "```"
+    is_md = args.format == "md"
     written = 0
     skipped_binary = 0
     skipped_large = 0
 
     writer = SplitWriter(output_path, split_limit)
 
-    # 分割ファイル名も除外するための正規表現を作る
+    # 分割ファイル名（{stem}_NNN{suffix}）も除外するための材料
     suffix = "".join(output_path.suffixes)              # 例: ".md"
     stem = output_path.name[:-len(suffix)] if suffix else output_path.name  # 例: "project"
-    part_re = re.compile(rf"^{re.escape(stem)}_\d{{3}}{re.escape(suffix)}$")
+    part_prefix = stem + "_"
+    part_len = len(part_prefix) + 3 + len(suffix)
 
     try:
-        writer.write(f"ディレクトリ:{target_dir.name}\n")
-        writer.write(f"対象:{target_dir.as_posix()}\n")
-        writer.write(f"出力:{output_path.as_posix()}\n\n")
+        writer.write(
+            f"ディレクトリ:{target_dir.name}\n"
+            f"対象:{target_dir.as_posix()}\n"
+            f"出力:{output_path.as_posix()}\n\n"
+        )
 
         if not args.no_structure:
-            writer.write("構造:\n")
-            for line in build_structure_lines(
-                target_dir=target_dir,
-                exclude_names=exclude_names,
-                exclude_prefixes=exclude_prefixes,
-                max_entries=args.structure_max,
-                include_excluded=True,
-            ):
-                writer.write(line + "\n")
-            writer.write("\n---\n\n")
-
-        for p in files:
+            if structure_lines is None:
+                # git mode: the structure still needs its own walk
+                structure_lines = build_structure_lines(
+                    target_dir=target_dir,
+                    exclude_names=exclude_names,
+                    exclude_prefixes=exclude_prefixes,
+                    max_entries=args.structure_max,
+                    include_excluded=True,
+                )
+            # the whole block in one write
+            body = "".join([line + "\n" for line in structure_lines])
+            writer.write(f"構造:\n{body}\n---\n\n")
+
+        # output_path is already resolved; compare strings instead of resolve() per file
+        output_abs = os.fspath(output_path)
+        to_read: List[str] = []
+        to_read_rels: List[str] = []
+        for abs_str, rel, size in files:
+            name = rel.rsplit("/", 1)[-1]
             # Prevent self-inclusion (単体 + 分割ファイル)
-            if p.resolve() == output_path.resolve() or part_re.match(p.name):
+            if abs_str == output_abs:
+                continue
+            # split part: same as ^{stem}_\d{3}{suffix}$, without a regex per file
+            if (
+                len(name) == part_len
+                and name.startswith(part_prefix)
+                and name.endswith(suffix)
+                and name[len(part_prefix):len(part_prefix) + 3].isdigit()
+            ):
                 continue
 
-            if args.max_bytes and p.stat().st_size > args.max_bytes:
+            if args.max_bytes and size > args.max_bytes:
                 skipped_large += 1
                 continue
 
-            content = safe_read_text(p)
+            to_read.append(abs_str)
+            to_read_rels.append(rel)
+
+        # names were already filtered by the collectors (ext whitelist + _binary_by_name)
+        cache_dir = default_cache_dir() if args.cache else None
+        if cache_dir is not None:
+            prune_cache(cache_dir)
+        contents = read_texts(to_read, jobs, check_name=False, cache_dir=cache_dir)
+        for rel, (_, content) in zip(to_read_rels, contents):
             if content is None:
                 skipped_binary += 1
                 continue
 
-            rel = p.relative_to(target_dir)
-            rel_parent = rel.parent.as_posix()
-            path_str = "/" if rel_parent == "." else (rel_parent + "/")
-
-            writer.write(f"ファイル名:{p.name}\n")
-            writer.write(f"パス:{path_str}\n")
-            writer.write("内容\n")
-
-            if args.format == "md":
-                lang = language_from_path(p)
-                writer.write(f"{fence}{lang}\n")
-                writer.write(content)
-                if not content.endswith("\n"):
-                    writer.write("\n")
-                writer.write(f"{fence}\n\n")
-            else:
-                writer.write(content)
-                if not content.endswith("\n"):
-                    writer.write("\n")
-                writer.write("\n")
+            rel_parent, _, name = rel.rpartition("/")
+            path_str = (rel_parent + "/") if rel_parent else "/"
 
-            writer.write("---\n\n")
+            nl = "" if content.endswith("\n") else "\n"
+            # one write per file (a file section is never split across parts)
+            if is_md:
+                lang = language_from_name(name.lower())
+                writer.write(SECTION_TMPL_MD % (name, path_str, lang, content, nl))
+            else:
+                writer.write(SECTION_TMPL_TXT % (name, path_str, content, nl))
             written += 1
 
-        writer.write(f"出力ファイル数: {written}\n")
-        writer.write(f"スキップ（バイナリ判定）: {skipped_binary}\n")
+        summary = [
+            f"出力ファイル数: {written}\n",
+            f"スキップ（バイナリ判定）: {skipped_binary}\n",
+        ]
         if args.max_bytes:
-            writer.write(f"スキップ（max-bytes超過）: {skipped_large}\n")
-        writer.write(f"収集方式: {'git ls-files' if use_git else 'filesystem walk'}\n")
-        writer.write(f"モード: {'all-text' if args.all_text else 'ext-filter'}\n")
+            summary.append(f"スキップ（max-bytes超過）: {skipped_large}\n")
+        summary.append(f"収集方式: {'git ls-files' if use_git else 'filesystem walk'}\n")
+        summary.append(f"モード: {'all-text' if args.all_text else 'ext-filter'}\n")
+        writer.write("".join(summary))
 
     finally:
         writer.close()
@@ -719,7 +1182,8 @@ def main() -> int:
 
 class SplitWriter:
     """
-    Write UTF-8 text to a file, and split into multiple files when size exceeds limit.
+    Write UTF-8 text (str, or already-encoded bytes) to a file, and split into
+    multiple files when size exceeds limit.
     - If output stays within limit: keep the original output_path.
     - If it exceeds: rename output_path -> *_001 and continue with *_002, *_003...
     """
@@ -763,7 +1227,9 @@ class SplitWriter:
         if path.exists():
             path.unlink()
 
-        self._fp = path.open("w", encoding="utf-8", newline="\n")
+        # binary + large buffer: text is encoded once in write(), and a
+        # multi-MB dump becomes a handful of write() syscalls
+        self._fp = path.open("wb", buffering=WRITE_BUFFER_BYTES)
         self._current_path = path
         self._written_bytes = 0
 
@@ -772,8 +1238,9 @@ class SplitWriter:
         else:
             self.part_paths.append(path)
             # optional small marker for continuation
-            self._fp.write(f"\n\n（続き / part {part_index}）\n\n")
-            self._written_bytes += len(f"\n\n（続き / part {part_index}）\n\n".encode("utf-8"))
+            marker = f"\n\n（続き / part {part_index}）\n\n".encode("utf-8")
+            self._fp.write(marker)
+            self._written_bytes += len(marker)
 
     def _start_splitting_if_needed(self):
         if self._split_started:
@@ -817,16 +1284,18 @@ class SplitWriter:
             self._open_new(next_path, part_index=self._part_index, is_first=False)
             self._part_index += 1
 
-    def write(self, text: str):
+    def write(self, data: Union[str, bytes]):
         if not self._fp:
             # should not happen, but be safe
             self._open_new(self._current_path, part_index=self._part_index, is_first=False)
 
-        data = text.encode("utf-8")
+        # encode once: the same bytes are measured and written
+        if isinstance(data, str):
+            data = data.encode("utf-8")
         self._rotate_if_needed(len(data))
 
         # If a single chunk is larger than limit, it will exceed; caller can use --max-bytes to avoid huge sections.
-        self._fp.write(text)
+        self._fp.write(data)
         self._written_bytes += len(data)
 
     def close(self):
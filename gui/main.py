@@ -2,12 +2,14 @@ from __future__ import annotations
 
 # --- 追加import（先頭の import 群に足す） ---
 import os
+from collections import OrderedDict
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 
 from pathlib import Path
 
-from PyQt6.QtGui import QBrush, QColor, QCursor
-from PyQt6.QtCore import Qt, QPoint
+from PyQt6.QtGui import QBrush, QColor, QCursor, QStandardItem
+from PyQt6.QtCore import Qt, QObject, QPoint, QRunnable, QThreadPool, QTimer, pyqtSignal
 from PyQt6.QtWidgets import (
     QAbstractItemView,
     QHeaderView,
@@ -42,20 +44,49 @@ class WizardState:
 
 # ===== RulesPage 実装 =====
 
-PATH_ROLE = int(Qt.ItemDataRole.UserRole) + 1
-RULE_ROLE = int(Qt.ItemDataRole.UserRole) + 2
-IS_DIR_ROLE = int(Qt.ItemDataRole.UserRole) + 3
-LOADED_ROLE = int(Qt.ItemDataRole.UserRole) + 4
-PLACEHOLDER_ROLE = int(Qt.ItemDataRole.UserRole) + 5
+# Path 列 item のノード情報（NodeMeta）。役割ごとに setData せず、1つにまとめて持つ
+META_ROLE = int(Qt.ItemDataRole.UserRole) + 1
 
 RULE_INHERIT  = 0  # 継承（明示なし）
 RULE_EXCLUDE  = 1  # 除外（mdに出さない / codexでは禁止）
 RULE_TREEONLY = 2  # 構造のみ（パスだけ / codexでは基本禁止）
 RULE_TEXT     = 3  # 本文あり（mdに本文も出す / codexで編集対象にできる）
 
+
+class NodeMeta:
+    """Path 列 item 1つ分のノード情報（__slots__: 属性アクセスを速く・1件あたり小さく）"""
+
+    # dataclass(slots=True) は Python 3.10+ なので手書き（3.9 でも import できるように）
+    __slots__ = ("rel", "path", "rule", "eff", "is_dir", "loaded", "placeholder", "overflow", "rule_item")
+
+    def __init__(
+        self,
+        rel: str = "",                        # project_root からの相対パス（posix, root は ""）
+        path: str | None = None,              # 実パス（プレースホルダは None）
+        rule: int = RULE_INHERIT,             # 明示ルール
+        eff: int = RULE_INHERIT,              # 実効ルール（継承を解決済み）。ルール変更時だけ更新する
+        is_dir: bool = False,
+        loaded: bool = False,
+        placeholder: bool = False,            # 「…」「… あと N 件」行
+        overflow: list | None = None,         # 「… あと N 件」行: まだ出していない entries の残り
+        rule_item: QStandardItem | None = None,  # 同じ行の Rule 列 item（index 経由で引き直さない）
+    ):
+        self.rel = rel
+        self.path = path
+        self.rule = rule
+        self.eff = eff
+        self.is_dir = is_dir
+        self.loaded = loaded
+        self.placeholder = placeholder
+        self.overflow = overflow
+        self.rule_item = rule_item
+
+
 BG_EXCLUDE  = QBrush(QColor(255, 100, 100))
 BG_TREEONLY = QBrush(QColor(170, 130, 0))
 BG_TEXT     = QBrush(QColor(0, 120, 0))
+# 実効ルール -> 背景色（RULE_* の値で引く）
+BG_BY_RULE = (QBrush(), BG_EXCLUDE, BG_TREEONLY, BG_TEXT)
 
 
 def rule_label(rule: int) -> str:
@@ -81,6 +112,48 @@ def token_to_rule(token: str) -> int:
     }.get(token, RULE_INHERIT)
 
 
+# ツリーに出さない名前
+_HIDDEN_DIRS = frozenset({".git", "__pycache__"})
+
+# load_children の scandir キャッシュに持つディレクトリ数
+SCANDIR_CACHE_MAX = 256
+
+
+def scan_sorted(path) -> list[tuple[str, bool, str]]:
+    # ディレクトリ直下を scandir して「ディレクトリ優先・名前順」に並べる（.git などは除く）
+    # is_dir は1回だけ呼んで (name, is_dir, path) に詰める（ソートでもループでも使い回す）
+    with os.scandir(path) as it:
+        raw = [
+            (e.name, e.is_dir(follow_symlinks=False), e.path)
+            for e in it
+            if e.name not in _HIDDEN_DIRS
+        ]
+    raw.sort(key=lambda t: (not t[1], t[0].lower()))
+    return raw
+
+
+class ScanWorker(QRunnable):
+    """ディレクトリ1つを別スレッドで scan_sorted する。結果は finished で GUI スレッドへ。"""
+
+    class Signals(QObject):
+        # (世代番号, scan_sorted の結果, エラーメッセージ or "")
+        finished = pyqtSignal(int, list, str)
+
+    def __init__(self, path, generation: int):
+        super().__init__()
+        self.path = path
+        self.generation = generation
+        self.signals = ScanWorker.Signals()
+
+    def run(self):
+        try:
+            entries = scan_sorted(self.path)
+        except Exception as e:
+            self.signals.finished.emit(self.generation, [], str(e))
+            return
+        self.signals.finished.emit(self.generation, entries, "")
+
+
 class RulesPage(QFrame):
     """Step 2: 変更禁止/許可/継承 をツリーで設定"""
 
@@ -118,8 +191,15 @@ class RulesPage(QFrame):
         self.tree.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.tree.customContextMenuRequested.connect(self.open_menu)
         self.tree.expanded.connect(self.on_expand)
-
-        from PyQt6.QtGui import QStandardItemModel, QStandardItem
+        self.tree.clicked.connect(self.on_click)
+        # 展開アニメーションを切る（展開ごとの再レイアウトを減らす）
+        self.tree.setAnimated(False)
+        # 行の高さは全行同じ: 行ごとの高さ計算を省く
+        self.tree.setUniformRowHeights(True)
+        # 折り返しなし（長いパスは ElideMiddle で省略）: 行の高さが文字列に左右されない
+        self.tree.setWordWrap(False)
+
+        from PyQt6.QtGui import QStandardItemModel
         self.QStandardItem = QStandardItem
         self.model = QStandardItemModel()
         self.model.setHorizontalHeaderLabels(["Path", "Rule"])
@@ -152,11 +232,41 @@ class RulesPage(QFrame):
         self.btn_apply_suggest.clicked.connect(self.apply_suggestions)
         self.btn_clear.clicked.connect(self.clear_explicit_rules)
 
-        self.initial_expand_depth = 3
-        self.max_total_nodes = 5000
+        # 1ディレクトリで一度に出す件数（残りは「… あと N 件」行から追加）
+        self.per_dir_limit = 2000
+        # reload_tree ごとに増やす（古い ScanWorker の結果を捨てる用）
+        self._scan_generation = 0
+        self._scan_signals = None
+        # load_children 用: path -> (mtime_ns, scan_sorted の結果)。古いものから捨てる
+        self._scandir_cache: OrderedDict[str, tuple[int, list]] = OrderedDict()
+        # state.project_rules の索引: 親の rel -> {名前: token}（子を作るときは親の分だけ見る）
+        self._rules_by_parent: dict[str, dict[str, str]] = {}
 
         self.reload_tree()
 
+    @contextmanager
+    def _bulk_update(self):
+        # 多数行のルール/色をまとめて変える処理（apply / clear）用。行の追加には使わない
+        # （追加は _append_entries で rowsInserted を出したまま、再描画だけ止める）。
+        # まとめて触る間はモデルのシグナル・ビューの再描画・アニメーションを止め、
+        # layoutAboutToBeChanged / layoutChanged を1組だけ出す。入れ子OK（外側の with だけが通知する）
+        # ※ 1行のルール変更は _refresh_effective_colors が範囲指定の dataChanged で通知する
+        if not self.model.signalsBlocked():
+            self.model.layoutAboutToBeChanged.emit()
+        was_blocked = self.model.blockSignals(True)
+        was_updating = self.tree.updatesEnabled()
+        was_animated = self.tree.isAnimated()
+        self.tree.setUpdatesEnabled(False)
+        self.tree.setAnimated(False)
+        try:
+            yield
+        finally:
+            self.model.blockSignals(was_blocked)
+            self.tree.setAnimated(was_animated)
+            self.tree.setUpdatesEnabled(was_updating)
+            if not was_blocked:
+                self.model.layoutChanged.emit()
+
     def _fit_columns(self):
         # viewport幅に合わせて Path列(0) を自動調整
         vw = self.tree.viewport().width()
@@ -167,33 +277,12 @@ class RulesPage(QFrame):
         super().resizeEvent(e)
         self._fit_columns()
 
-    def preload_to_depth(self, item0, depth: int, counter: list[int]):
-        if depth <= 0:
-            return
-        if counter[0] >= self.max_total_nodes:
-            return
-
-        self.load_children(item0)
-
-        # ここで “ディレクトリだけ” 掘る（ファイルはそのまま表示されるのでOK）
-        for i in range(item0.rowCount()):
-            if counter[0] >= self.max_total_nodes:
-                break
-
-            c0 = item0.child(i, 0)
-            if not c0:
-                continue
-
-            counter[0] += 1
-
-            if c0.data(IS_DIR_ROLE):
-                # 展開（見た目も深くなる）
-                self.tree.expand(c0.index())
-                self.preload_to_depth(c0, depth - 1, counter)
-
     # ---------- core ----------
     def reload_tree(self):
+        # 古い再読み込みの結果は世代番号で捨てる
+        self._scan_generation += 1
         self.model.removeRows(0, self.model.rowCount())
+        self._index_rules()
         root = self.state.project_root
         if not root or not root.exists():
             self.status.setText("Step1でプロジェクトルートを選択してください。")
@@ -201,138 +290,178 @@ class RulesPage(QFrame):
 
         root_item = self.QStandardItem(root.name + "/")
         rule_item = self.QStandardItem(rule_label(RULE_INHERIT))
-        root_item.setData(root, PATH_ROLE)
-        root_item.setData(RULE_INHERIT, RULE_ROLE)
-        root_item.setData(True, IS_DIR_ROLE)
-        root_item.setData(False, LOADED_ROLE)
+        meta = NodeMeta(rel="", path=str(root), is_dir=True, rule_item=rule_item)
 
-        # 既存stateのルールがあれば反映
+        # 既存stateのルールがあれば反映（root は親がないので実効ルール = 自分のルール）
         if "" in self.state.project_rules:
-            root_item.setData(token_to_rule(self.state.project_rules[""]), RULE_ROLE)
+            meta.rule = meta.eff = token_to_rule(self.state.project_rules[""])
 
+        root_item.setData(meta, META_ROLE)
         self.model.appendRow([root_item, rule_item])
+        self._sync_row(root_item)
+
+        self._fit_columns()
+
+        # ★ 直下だけ読み込む: scandir はワーカースレッドで（遅いディスク/共有フォルダでもUIを止めない）
+        worker = ScanWorker(root, self._scan_generation)
+        worker.signals.finished.connect(self._populate_root)
+        self._scan_signals = worker.signals  # 完了通知まで参照を保持
+        self.status.setText("読み込み中…")
+        QThreadPool.globalInstance().start(worker)
+
+    def _populate_root(self, generation: int, entries: list, error: str):
+        # ScanWorker の結果（GUIスレッドで受け取る）
+        if generation != self._scan_generation:
+            return
+        root_item = self.model.item(0, 0)
+        if not root_item:
+            return
+        if error:
+            self.status.setText(f"読み込み失敗: {error}")
+            return
 
-        # ★ 直下だけ読み込む
-        self.load_children(root_item)
+        # 待っている間に同期ロード済み（apply_suggestions 等）なら追加しない
+        meta = root_item.data(META_ROLE)
+        if not meta.loaded:
+            self._append_entries(root_item, entries)
+            meta.loaded = True
 
         # ★ rootだけ開いて、直下を見せる（それ以上は開かない）
         self.tree.expand(root_item.index())
 
         self._fit_columns()
 
-        self.status.setText(f"OK: {root} を読み込みました。")
+        self.status.setText(f"OK: {self.state.project_root} を読み込みました。")
 
     def validate(self) -> tuple[bool, str]:
         if self.state.project_root is None:
             return False, "先にプロジェクトルートを選択してください。"
+        self._export_to_state()
         return True, ""
 
     def load_children(self, item0):
-        if not item0.data(IS_DIR_ROLE):
-            return
-        if item0.data(LOADED_ROLE):
+        meta = item0.data(META_ROLE)
+        if not meta.is_dir or meta.loaded:
             return
 
         if item0.rowCount() == 1:
             c = item0.child(0, 0)
-            if c and c.data(PLACEHOLDER_ROLE):
+            if c and c.data(META_ROLE).placeholder:
                 item0.removeRows(0, 1)
 
-        path: Path = item0.data(PATH_ROLE)
+        path = meta.path
 
         if not path:
             return
 
         try:
-            entries = list(os.scandir(path))
+            entries = self._scan_cached(path)
         except Exception as e:
             self.status.setText(f"読み込み失敗: {e}")
             return
 
-        entries.sort(key=lambda e: (not e.is_dir(follow_symlinks=False), e.name.lower()))
-
-        for ent in entries:
-            name = ent.name
-            if name in {".git", "__pycache__"}:
-                continue
-
-            is_dir = ent.is_dir(follow_symlinks=False)
+        self._append_entries(item0, entries)
+        meta.loaded = True
+
+    def _scan_cached(self, path: str) -> list:
+        # 同じディレクトリの再展開・再読み込みではメモリから返す。
+        # キーはパス、ディレクトリの mtime が変わっていたら（追加/削除/改名）読み直す
+        mtime = os.stat(path).st_mtime_ns
+        cached = self._scandir_cache.get(path)
+        if cached and cached[0] == mtime:
+            self._scandir_cache.move_to_end(path)
+            return cached[1]
+
+        entries = scan_sorted(path)
+        self._scandir_cache[path] = (mtime, entries)
+        self._scandir_cache.move_to_end(path)
+        while len(self._scandir_cache) > SCANDIR_CACHE_MAX:
+            self._scandir_cache.popitem(last=False)
+        return entries
+
+    def _append_entries(self, item0, entries: list):
+        # entries（scan_sorted の (name, is_dir, path)）を per_dir_limit 件まで子として追加。
+        # 残りは「… あと N 件」行に持たせ、クリックされたら続きを追加する。
+        page = entries[:self.per_dir_limit]
+        rest = entries[self.per_dir_limit:]
+
+        # 子の実効ルール（継承時）は全員同じ: 親の実効ルールを1回だけ計算
+        parent_eff = self.effective_rule(item0)
+        # 子の rel は親の rel + 名前（Path.relative_to を子ごとに呼ばない）
+        parent_rel = item0.data(META_ROLE).rel
+        rel_base = parent_rel + "/" if parent_rel else ""
+        # この親の配下に保存済みルールがあるか（名前で引く）
+        bucket = self._rules_by_parent.get(parent_rel, {})
+
+        # 行はまとめて作ってから一括で追加（1行ごとの appendRow → シグナル/再レイアウトを避ける）
+        col0: list = []
+        col1: list = []
+        for name, is_dir, ent_path in page:
             label = name + ("/" if is_dir else "")
             child0 = self.QStandardItem(label)
-            child1 = self.QStandardItem(rule_label(RULE_INHERIT))
-
-            child_path = Path(ent.path)
-            child0.setData(child_path, PATH_ROLE)
-            child0.setData(RULE_INHERIT, RULE_ROLE)
-            child0.setData(is_dir, IS_DIR_ROLE)
-            child0.setData(False, LOADED_ROLE)
 
+            rule = RULE_INHERIT
+            token = bucket.get(name)
+            if token is not None:
+                rule = token_to_rule(token)
+            # 実効ルールは作成時に確定させておく（継承なら親の値）
+            eff = rule if rule != RULE_INHERIT else parent_eff
+
+            # 文字・色はモデルに入れる前に直接設定（itemFromIndex での引き直し不要）
+            child1 = self.QStandardItem(rule_label(rule))
+            # path は DirEntry.path の文字列のまま持つ（Path は作らない）
+            meta = NodeMeta(rel=rel_base + name, path=ent_path, rule=rule, eff=eff,
+                            is_dir=is_dir, rule_item=child1)
+            child0.setData(meta, META_ROLE)
             if is_dir:
                 self._add_placeholder_if_dir(child0)
 
-            rel = self._rel_posix(child_path)
-            if rel in self.state.project_rules:
-                child0.setData(token_to_rule(self.state.project_rules[rel]), RULE_ROLE)
+            bg = BG_BY_RULE[eff]
+            child0.setBackground(bg)
+            child1.setBackground(bg)
 
-            item0.appendRow([child0, child1])
-            self._sync_row(child0)
+            col0.append(child0)
+            col1.append(child1)
 
-        item0.setData(True, LOADED_ROLE)
-        self._refresh_effective_colors(item0)
+        if rest:
+            more0 = self.QStandardItem(f"… あと {len(rest)} 件（クリックで読み込む）")
+            more0.setData(NodeMeta(placeholder=True, overflow=rest), META_ROLE)
+            col0.append(more0)
+            col1.append(self.QStandardItem(""))
 
-    # ---------- lazy load ----------
-    def on_expand(self, index):
+        # rowsInserted はそのまま通知（ビューはこの親の配下だけ更新する）。再描画だけ最後に1回へまとめる
+        start = item0.rowCount()
+        was_updating = self.tree.updatesEnabled()
+        self.tree.setUpdatesEnabled(False)
+        try:
+            item0.appendRows(col0)
+            for i, child1 in enumerate(col1):
+                item0.setChild(start + i, 1, child1)
+            # 新しい子はここで色付け済み（配下は未ロード）なので、item0 側の再計算は不要
+        finally:
+            self.tree.setUpdatesEnabled(was_updating)
+
+    def on_click(self, index):
+        # 「… あと N 件」行なら、その行を外して次のページを追加
         item0 = self.model.itemFromIndex(index.siblingAtColumn(0))
         if not item0:
             return
-        self.load_children(item0)
-        if not item0.data(IS_DIR_ROLE):
-            return
-        if item0.data(LOADED_ROLE):
+        rest = item0.data(META_ROLE).overflow
+        if not rest:
             return
-
-        path: Path = item0.data(PATH_ROLE)
-        if not path:
+        parent0 = item0.parent()
+        if not parent0:
             return
+        parent0.removeRows(item0.row(), 1)
+        self._append_entries(parent0, rest)
 
-        # 子を生成
-        try:
-            entries = list(os.scandir(path))
-        except Exception as e:
-            self.status.setText(f"読み込み失敗: {e}")
+    # ---------- lazy load ----------
+    def on_expand(self, index):
+        item0 = self.model.itemFromIndex(index.siblingAtColumn(0))
+        if not item0:
             return
-
-        # sort: dirs first
-        entries.sort(key=lambda e: (not e.is_dir(follow_symlinks=False), e.name.lower()))
-
-        for ent in entries:
-            name = ent.name
-
-            # 超巨大で邪魔になりがちなもの（必要ならここを調整）
-            if name in {".git", "__pycache__"}:
-                continue
-
-            is_dir = ent.is_dir(follow_symlinks=False)
-            label = name + ("/" if is_dir else "")
-            child0 = self.QStandardItem(label)
-            child1 = self.QStandardItem(rule_label(RULE_INHERIT))
-
-            child_path = Path(ent.path)
-            child0.setData(child_path, PATH_ROLE)
-            child0.setData(RULE_INHERIT, RULE_ROLE)
-            child0.setData(is_dir, IS_DIR_ROLE)
-            child0.setData(False, LOADED_ROLE)
-
-            # stateに明示ルールがあれば復元（rel_posix）
-            rel = self._rel_posix(child_path)
-            if rel in self.state.project_rules:
-                child0.setData(token_to_rule(self.state.project_rules[rel]), RULE_ROLE)
-
-            item0.appendRow([child0, child1])
-            self._sync_row(child0)
-
-        item0.setData(True, LOADED_ROLE)
-        self._refresh_effective_colors(item0)
+        # 読み込み（プレースホルダ除去・scandir・ルール復元・色付け）は load_children に集約
+        self.load_children(item0)
 
     # ---------- context menu ----------
     def open_menu(self, pos):
@@ -341,7 +470,7 @@ class RulesPage(QFrame):
             return
 
         item0 = self.model.itemFromIndex(index.siblingAtColumn(0))
-        if not item0:
+        if not item0 or item0.data(META_ROLE).placeholder:
             return
 
         global_pos = self.tree.viewport().mapToGlobal(pos)  # ★追加
@@ -364,92 +493,140 @@ class RulesPage(QFrame):
             self.set_explicit_rule(item0, RULE_TEXT)
 
     def set_explicit_rule(self, item0, rule: int):
-        item0.setData(rule, RULE_ROLE)
-        self._sync_row(item0)
+        meta = item0.data(META_ROLE)
+        # 同じルールを選び直しただけなら何もしない（表示も state も変わらない）
+        if meta.rule == rule:
+            return
+        meta.rule = rule
+        self._set_row_text(item0, rule)
+        # 色は item0 と、それを継承している配下だけ塗り直す
         self._refresh_effective_colors(item0)
-        self._export_to_state()
+        # state はこの1件だけ更新（ツリー全体は辿らない）
+        self._store_rule(meta.rel, rule)
 
     # ---------- helpers ----------
     def _sync_row(self, item0):
+        meta = item0.data(META_ROLE)
+        self._set_row_text(item0, meta.rule)
+        self._set_row_bg(item0, meta.eff)
+
+    def _rule_item(self, item0):
+        # 同じ行の Rule 列 item（作成時に NodeMeta.rule_item へ入れてある）
+        rule_item = item0.data(META_ROLE).rule_item
+        if rule_item is None:
+            rule_item = self.model.itemFromIndex(item0.index().siblingAtColumn(1))
+        return rule_item
+
+    def _set_row_text(self, item0, rule: int):
         # rule列を更新
-        rule = int(item0.data(RULE_ROLE) or RULE_INHERIT)
-        rule_item = self.model.itemFromIndex(item0.index().siblingAtColumn(1))
+        rule_item = self._rule_item(item0)
         if rule_item:
             rule_item.setText(rule_label(rule))
 
-        # 実効ルールで色付け（軽め）
-        eff = self.effective_rule(item0)
-        bg = QBrush()
-        if eff == RULE_EXCLUDE:
-            bg = BG_EXCLUDE
-        elif eff == RULE_TREEONLY:
-            bg = BG_TREEONLY
-        elif eff == RULE_TEXT:
-            bg = BG_TEXT
-
+    def _set_row_bg(self, item0, eff: int):
+        bg = BG_BY_RULE[eff]
         item0.setBackground(bg)
+        rule_item = self._rule_item(item0)
         if rule_item:
             rule_item.setBackground(bg)
 
     def effective_rule(self, item0) -> int:
-        # 自分が明示ならそれ。継承なら親を辿る。
-        cur = item0
-        while cur:
-            r = int(cur.data(RULE_ROLE) or RULE_INHERIT)
-            if r != RULE_INHERIT:
-                return r
-            cur = cur.parent()
-        return RULE_INHERIT
-
-    def _refresh_effective_colors(self, item0):
-        # item0 と配下（すでにロード済みの範囲）を更新
-        stack = [item0]
-        while stack:
-            it = stack.pop()
-            self._sync_row(it)
-            for i in range(it.rowCount()):
-                child0 = it.child(i, 0)
-                if child0:
-                    stack.append(child0)
-
-    def _rel_posix(self, p: Path) -> str:
-        root = self.state.project_root
-        if not root:
-            return ""
+        # 作成時 / ルール変更時に NodeMeta.eff へ入れてある（親を辿らない）
+        return item0.data(META_ROLE).eff
+
+    def _refresh_effective_colors(self, item0, parent_eff: int | None = None):
+        # item0 と、item0 のルールを継承している配下（ロード済みの範囲）だけ実効ルールと色を更新。
+        # 実効ルールは親から渡していく（ノードごとにルートまで辿り直さない）。
+        # 明示ルールを持つ子は色も配下も変わらないので、そこで打ち切る。
+        if parent_eff is None:
+            parent = item0.parent()
+            parent_eff = self.effective_rule(parent) if parent else RULE_INHERIT
+
+        # 1件ずつの dataChanged を止め、塗り直した行を親ごとの範囲で通知する
+        # （ツリー全体の再レイアウトはしない。_bulk_update の中ならそちらの layoutChanged に任せる）
+        notify = not self.model.signalsBlocked()
+        spans: dict = {}  # 親 item（root 行は None）-> (最小 row, 最大 row, 最小 row の item)
+        self.model.blockSignals(True)
         try:
-            return p.relative_to(root).as_posix()
-        except Exception:
-            return ""
+            stack = [(item0, parent_eff)]
+            while stack:
+                it, inherited = stack.pop()
+                meta = it.data(META_ROLE)
+                eff = meta.rule if meta.rule != RULE_INHERIT else inherited
+                meta.eff = eff
+                self._set_row_bg(it, eff)
+
+                if notify:
+                    key = it.parent()
+                    row = it.row()
+                    span = spans.get(key)
+                    if span is None:
+                        spans[key] = (row, row, it)
+                    elif row < span[0]:
+                        spans[key] = (row, span[1], it)
+                    elif row > span[1]:
+                        spans[key] = (span[0], row, span[2])
+
+                for i in range(it.rowCount()):
+                    child0 = it.child(i, 0)
+                    if not child0:
+                        continue
+                    m = child0.data(META_ROLE)
+                    if m.placeholder or m.rule != RULE_INHERIT:
+                        continue
+                    stack.append((child0, eff))
+        finally:
+            self.model.blockSignals(not notify)
+
+        roles = [Qt.ItemDataRole.BackgroundRole]
+        for first, last, first_item in spans.values():
+            top_left = first_item.index()
+            bottom_right = top_left.sibling(last, 1)
+            self.model.dataChanged.emit(top_left, bottom_right, roles)
+
+    def _store_rule(self, rel: str, rule: int):
+        # 明示（本文あり / 除外）だけ保存。それ以外はキーごと消す（_rules_by_parent も同時に更新）
+        parent_rel, _, name = rel.rpartition("/")
+        if rule in (RULE_TEXT, RULE_EXCLUDE):
+            token = rule_to_token(rule)
+            self.state.project_rules[rel] = token
+            if rel:
+                self._rules_by_parent.setdefault(parent_rel, {})[name] = token
+        else:
+            self.state.project_rules.pop(rel, None)
+            if rel:
+                self._rules_by_parent.get(parent_rel, {}).pop(name, None)
+
+    def _index_rules(self):
+        # state.project_rules から _rules_by_parent を作り直す（root の "" は reload_tree で直接見る）
+        by_parent: dict[str, dict[str, str]] = {}
+        for rel, token in self.state.project_rules.items():
+            if not rel:
+                continue
+            parent_rel, _, name = rel.rpartition("/")
+            by_parent.setdefault(parent_rel, {})[name] = token
+        self._rules_by_parent = by_parent
 
     def _export_to_state(self):
-        # 明示（継承以外）だけ保存
-        rules: dict[str, str] = {}
+        # 念のための一括同期（validate 時のみ）。ふだんは set_explicit_rule で1件ずつ更新している。
+        # ロード済みノードの分だけ上書きし、未ロード配下の保存済みルールは残す
+        root0 = self.model.item(0, 0)
+        if not root0:
+            return
 
-        def walk(item0):
-            rule = int(item0.data(RULE_ROLE) or RULE_INHERIT)
-            path: Path = item0.data(PATH_ROLE)
-            rel = self._rel_posix(path) if path else ""
-            if rule in (RULE_TEXT, RULE_EXCLUDE):
-                rules[rel] = rule_to_token(rule)
+        stack = [root0]
+        while stack:
+            item0 = stack.pop()
+            meta = item0.data(META_ROLE)
+            # プレースホルダ行はスキップ
+            if meta.placeholder:
+                continue
+            self._store_rule(meta.rel, meta.rule)
 
             for i in range(item0.rowCount()):
                 c0 = item0.child(i, 0)
                 if c0:
-                    walk(c0)
-
-        root0 = self.model.item(0, 0)
-        if root0:
-            # ルートに明示ルールを許可（rel=""）
-            rule = int(root0.data(RULE_ROLE) or RULE_INHERIT)
-            if rule in (RULE_TEXT, RULE_EXCLUDE):
-                rules[""] = rule_to_token(rule)
-
-            for i in range(root0.rowCount()):
-                c0 = root0.child(i, 0)
-                if c0:
-                    walk(c0)
-
-        self.state.project_rules = rules
+                    stack.append(c0)
 
     def apply_suggestions(self):
         # ルート直下をある程度展開してから、よくある候補を禁止にする
@@ -458,26 +635,27 @@ class RulesPage(QFrame):
             return
 
         # root直下が未ロードなら展開してロード
-        if not root0.data(LOADED_ROLE):
+        if not root0.data(META_ROLE).loaded:
             self.on_expand(root0.index())
 
         deny_names = {"vendor", "node_modules", "storage", "var", ".git", "public/build", "dist", "build"}
         # 直下だけ対象（必要なら検索を深くする）
-        for i in range(root0.rowCount()):
-            child0 = root0.child(i, 0)
-            if not child0:
-                continue
-            p: Path = child0.data(PATH_ROLE)
-            rel = self._rel_posix(p)
-            base = (p.name if p else "")
-            if base in deny_names or rel in deny_names:
-                self.set_explicit_rule(child0, RULE_EXCLUDE)
+        with self._bulk_update():
+            for i in range(root0.rowCount()):
+                child0 = root0.child(i, 0)
+                if not child0:
+                    continue
+                rel = child0.data(META_ROLE).rel
+                base = rel.rsplit("/", 1)[-1]
+                if base in deny_names or rel in deny_names:
+                    self.set_explicit_rule(child0, RULE_EXCLUDE)
 
         self.status.setText("OK: よくある候補に変更禁止を付与しました。")
 
     def clear_explicit_rules(self):
         # まず保存している明示ルールを全消し（未ロードのノードも含めて完全にクリア）
         self.state.project_rules = {}
+        self._rules_by_parent = {}
 
         root0 = self.model.item(0, 0)
         if not root0:
@@ -485,14 +663,15 @@ class RulesPage(QFrame):
             return
 
         def walk(item0):
+            meta = item0.data(META_ROLE)
             # プレースホルダ行はスキップ
-            if item0.data(PLACEHOLDER_ROLE):
+            if meta.placeholder:
                 return
 
-            item0.setData(RULE_INHERIT, RULE_ROLE)
+            meta.rule = RULE_INHERIT
 
             # Rule列の表示更新
-            rule_item = self.model.itemFromIndex(item0.index().siblingAtColumn(1))
+            rule_item = self._rule_item(item0)
             if rule_item:
                 rule_item.setText(rule_label(RULE_INHERIT))
 
@@ -504,47 +683,30 @@ class RulesPage(QFrame):
                 if c0:
                     walk(c0)
 
-        walk(root0)
+        with self._bulk_update():
+            walk(root0)
 
-        # 表示上の実効ルール色も更新（メソッドがある場合だけ）
-        if hasattr(self, "_refresh_effective_colors"):
-            self._refresh_effective_colors(root0)
+            # 表示上の実効ルール色も更新（メソッドがある場合だけ）
+            if hasattr(self, "_refresh_effective_colors"):
+                self._refresh_effective_colors(root0)
 
         self.status.setText("OK: 明示ルールを全解除しました。")
 
     def _add_placeholder_if_dir(self, item0):
-        if not item0.data(IS_DIR_ROLE):
-            return
-        if item0.data(LOADED_ROLE):
+        meta = item0.data(META_ROLE)
+        if not meta.is_dir or meta.loaded:
             return
         # 既にプレースホルダがあるなら何もしない
         if item0.rowCount() > 0:
             c = item0.child(0, 0)
-            if c and c.data(PLACEHOLDER_ROLE):
+            if c and c.data(META_ROLE).placeholder:
                 return
 
         ph0 = self.QStandardItem("…")
         ph1 = self.QStandardItem("")
-        ph0.setData(True, PLACEHOLDER_ROLE)
+        ph0.setData(NodeMeta(placeholder=True), META_ROLE)
         item0.appendRow([ph0, ph1])
 
-        def clear_explicit_rules(self):
-            root0 = self.model.item(0, 0)
-            if not root0:
-                return
-
-            def walk(item0):
-                item0.setData(RULE_INHERIT, RULE_ROLE)
-                self._sync_row(item0)
-                for i in range(item0.rowCount()):
-                    c0 = item0.child(i, 0)
-                    if c0:
-                        walk(c0)
-
-            walk(root0)
-            self._export_to_state()
-            self.status.setText("OK: 明示ルールを全解除しました。")
-
 
 class TitleBar(QWidget):
     def __init__(self, parent: QMainWindow):
@@ -680,6 +842,12 @@ class ProjectPage(QFrame):
 
         lay.addStretch()
 
+        # 入力は1打鍵ごとに state へ書かず、手が止まってからまとめて反映（toPlainText も1回で済む）
+        self._commit_timer = QTimer(self)
+        self._commit_timer.setSingleShot(True)
+        self._commit_timer.setInterval(150)
+        self._commit_timer.timeout.connect(self._flush_edits)
+
         self._sync_from_state()
 
     def _sync_from_state(self):
@@ -693,15 +861,23 @@ class ProjectPage(QFrame):
             self.policy_edit.setPlainText(self.state.project_policy)
 
     def _on_name_changed(self, text: str):
-        self.state.project_name = text.strip()
+        self._commit_timer.start()
 
     def _on_purpose_changed(self):
-        self.state.project_purpose = self.purpose_edit.toPlainText().strip()
+        self._commit_timer.start()
 
     def _on_policy_changed(self):
+        self._commit_timer.start()
+
+    def _flush_edits(self):
+        # 3つの入力欄をまとめて state へ
+        self._commit_timer.stop()
+        self.state.project_name = self.name_edit.text().strip()
+        self.state.project_purpose = self.purpose_edit.toPlainText().strip()
         self.state.project_policy = self.policy_edit.toPlainText().strip()
 
     def choose_folder(self):
+        self._flush_edits()
         start_dir = str(self.state.project_root) if self.state.project_root else str(Path.home())
 
         path = QFileDialog.getExistingDirectory(
@@ -725,6 +901,8 @@ class ProjectPage(QFrame):
             self.status.setText("OK: ルートを選択しました（.git は見つかりませんでした）。")
 
     def validate(self) -> tuple[bool, str]:
+        # 待ち中の入力があれば先に反映
+        self._flush_edits()
         if self.state.project_root is None:
             return False, "先にプロジェクトルートを選択してください。"
         return True, ""
@@ -847,6 +1025,11 @@ class FramelessWizardWindow(QMainWindow):
             if not ok:
                 self.page_project.status.setText(msg)
                 return
+        elif self.current_step == 1 and hasattr(self, "page_rules"):
+            ok, msg = self.page_rules.validate()
+            if not ok:
+                self.page_rules.status.setText(msg)
+                return
 
         if self.current_step == self.pages.count() - 1:
             self.close()